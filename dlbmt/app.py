@@ -4,17 +4,42 @@ Provides real-time network monitoring, topology data, and automatic migration co
 """
 
 import os
+
+# Socket.IO async mode: "threading" (default), "eventlet" or "gevent".
+# Under "threading" the WebSocket transport is provided by simple-websocket,
+# so clients upgrade from long-polling instead of holding a polling thread.
+# The cooperative modes have to patch the standard library before anything
+# else imports it, so this stays at the very top of the module.
+ASYNC_MODE = os.environ.get("DLBMT_ASYNC_MODE", "threading")
+if ASYNC_MODE == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+elif ASYNC_MODE == "eventlet":
+    import eventlet
+    eventlet.monkey_patch()
+
+import queue
 import time
 import json
+import gzip
+import hashlib
 import logging
-import threading
+from itertools import islice
+import brotli
+import orjson
 from flask import Flask, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
+from engineio import packet as eio_packet
+from socketio import packet as sio_packet
+from readerwriterlock import rwlock
+from whitenoise import WhiteNoise
 
 from dlbmt_engine import DLBMTEngine, ControllerLevel
-from sdn_simulator import SDNSimulator, TOPOLOGIES
-from traffic_generator import TrafficGenerator
+from sdn_simulator import SDNSimulator, TOPOLOGIES, warmup_topologies
+from traffic_generator import TrafficGenerator, PATTERNS
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -22,13 +47,60 @@ from traffic_generator import TrafficGenerator
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# JSON – orjson for the float-heavy API payloads
+# ---------------------------------------------------------------------------
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson and emits bytes directly."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=ORJSON_OPTIONS),
+                                        mimetype=self.mimetype)
+
+
 # ---------------------------------------------------------------------------
 # App Setup – serve React build from frontend/dist
 # ---------------------------------------------------------------------------
 DIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "dist")
-app = Flask(__name__, static_folder=DIST_DIR, static_url_path="")
+app = Flask(__name__, static_folder=None)
+app.json = OrjsonProvider(app)
+
+# The React build is served by WhiteNoise in front of Flask, so asset
+# requests never reach a Flask view. Vite content-hashes everything under
+# assets/, which lets those files be cached as immutable.
+app.wsgi_app = WhiteNoise(
+    app.wsgi_app,
+    root=DIST_DIR,
+    index_file=True,
+    immutable_file_test=lambda path, url: url.startswith("/assets/"),
+)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
+
+# Response compression for JSON; /api/topology keeps its own per-ETag cache
+COMPRESS_LEVEL = 4
+app.config.update(
+    COMPRESS_MIMETYPES=["application/json"],
+    COMPRESS_ALGORITHM=["br", "gzip"],
+    COMPRESS_LEVEL=COMPRESS_LEVEL,
+    COMPRESS_BR_LEVEL=COMPRESS_LEVEL,
+)
+Compress(app)
+
+# Socket.IO packet serializer: "default" (JSON text, what the shipped dashboard
+# speaks) or "msgpack" (binary, for clients built with socket.io-msgpack-parser)
+SOCKETIO_SERIALIZER = os.environ.get("DLBMT_SOCKETIO_SERIALIZER", "default")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE,
+                    serializer=SOCKETIO_SERIALIZER)
 
 # ---------------------------------------------------------------------------
 # Global State
@@ -38,39 +110,224 @@ traffic_gen: TrafficGenerator = None
 auto_migration_enabled = True
 simulation_speed = 1.0   # ticks per second
 simulation_running = True
-sim_lock = threading.Lock()
+# Seed for the generated topology graphs; unset means a fresh random graph
+# per topology for each server process
+TOPOLOGY_SEED = (int(os.environ["DLBMT_TOPOLOGY_SEED"])
+                 if os.environ.get("DLBMT_TOPOLOGY_SEED") else None)
+ERROR_BACKOFF = 1.0      # seconds to pause the loop after a failed tick
+skipped_ticks = 0        # ticks that missed their deadline and were dropped
+# Traffic config changes accepted by the REST API and applied by the
+# simulation loop at the start of its next tick, under the same write lock
+config_queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+# Reader-writer lock: GET paths that still read the engine share the read
+# side; ticks, resets, migrations and config changes take the write side.
+sim_lock = rwlock.RWLockFair()
+
+# Broadcast fan-out
+LIVE_ROOM = "live"             # room every dashboard joins on connect
+BROADCAST_BATCH_SIZE = 50      # clients written to before yielding
+broadcast_in_flight = False    # set while a state_update fan-out is running
+latest_snapshot = None         # last broadcast state as a keyframe, replayed on connect
+
+# Delta encoding of state_update: every KEYFRAME_INTERVAL-th tick carries the
+# full snapshot, the ticks in between only the fields that changed.
+KEYFRAME_INTERVAL = 30
+state_seq = 0                  # monotonic sequence number of state_update
+prev_snapshot = None           # last broadcast snapshot, the base of the next delta
+# Per-tick events of ticks whose broadcast was dropped, carried into the next
+# state_update that goes out
+pending_migration = None
+pending_level_changes: dict = {}
+
+# Read-only REST views, rebuilt under sim_lock and published by swapping this
+# reference, so GET handlers can serve them without taking the lock.
+latest: dict = {}
+
+# Encoded /api/topology bodies and their ETag, keyed by the published view
+# object; bodies maps content-coding ("identity", "br", "gzip") to bytes
+_topology_cache = (None, None, {})  # (topology view, etag, bodies)
+TOPOLOGY_ENCODINGS = ["br", "gzip"]
 
 
 def init_simulation(topology_name: str = "atlanta"):
     """Initialize or reset the simulation."""
-    global simulator, traffic_gen
-    with sim_lock:
-        simulator = SDNSimulator(topology_name)
+    global simulator, traffic_gen, prev_snapshot, latest
+    global pending_migration, pending_level_changes
+    with sim_lock.gen_wlock():
+        prev_snapshot = None  # New controller set, next update is a keyframe
+        pending_migration, pending_level_changes = None, {}
+        simulator = SDNSimulator(topology_name, seed=TOPOLOGY_SEED)
         traffic_gen = TrafficGenerator(simulator.engine)
         traffic_gen.set_pattern("wave", 1.0)
         # Initial traffic tick to populate data
         traffic_gen.generate_tick()
         simulator.engine.update_controller_levels()
+        latest = build_views()
     logger.info(f"Simulation initialized with topology: {topology_name}")
 
 
+# ---------------------------------------------------------------------------
+# Published Views
+# ---------------------------------------------------------------------------
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given content-coding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESS_LEVEL)
+    return gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+
+
+def build_controllers_view() -> list:
+    """Controller statuses with per-resource totals and utilizations."""
+    engine = simulator.engine
+
+    counts, totals = engine.domain_totals()
+    util = engine.domain_utilization(totals)
+    totals = totals.round(2).tolist()
+    util = util.round(2).tolist()
+
+    controllers = []
+    for i, ctrl in enumerate(engine.controllers.values()):
+        info = ctrl.to_dict()
+        info["switch_count"] = int(counts[i])
+        info["total_cpu_used"], info["total_mem_used"], info["total_bw_used"] = totals[i]
+        info["cpu_utilization"], info["mem_utilization"], info["bw_utilization"] = util[i]
+        controllers.append(info)
+    return controllers
+
+
+def build_switches_view() -> list:
+    """Switch details with resource usage and distance to their controller."""
+    switches = []
+    usage_pct = (simulator.engine.switch_usage() * 100).tolist()
+    for (sw_id, sw), usage in zip(simulator.engine.switches.items(), usage_pct):
+        info = sw.to_dict()
+        info["resource_usage"] = round(usage, 2)
+        info["distance_to_controller"] = simulator.engine.get_distance(sw_id, sw.controller_id)
+        switches.append(info)
+    return switches
+
+
+def build_views() -> dict:
+    """
+    Build a fresh set of read-only views from the engine. Must be called with
+    the write side of sim_lock held; callers publish the result by reassigning `latest`, never
+    by mutating the published dict.
+    """
+    stats = simulator.engine.get_stats()
+    stats["traffic"] = traffic_gen.get_traffic_summary()
+    return {
+        "topology": simulator.get_topology_data(),
+        "controllers": build_controllers_view(),
+        "switches": build_switches_view(),
+        "stats": stats,
+        "timeseries": list(simulator.engine.load_history),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Background Simulation Loop
 # ---------------------------------------------------------------------------
 
-def simulation_loop():
-    """Background thread that runs the simulation."""
-    global simulation_running
+def encode_snapshot(snapshot: dict) -> dict:
+    """
+    Wrap a snapshot as {"seq", "full"} on keyframes or {"seq", "delta"} in
+    between, where the delta holds only the top-level fields and controllers
+    that changed since the previous broadcast. Call it only for a snapshot
+    that is about to be broadcast, as it becomes the base of the next delta.
+    """
+    global state_seq, prev_snapshot
+    state_seq += 1
+    prev = prev_snapshot
+    prev_snapshot = snapshot
+
+    if prev is None or state_seq % KEYFRAME_INTERVAL == 0:
+        return {"seq": state_seq, "full": snapshot}
+
+    delta = {k: v for k, v in snapshot.items()
+             if k != "controllers" and prev.get(k) != v}
+    prev_ctrls = prev["controllers"]
+    changed = {cid: info for cid, info in snapshot["controllers"].items()
+               if prev_ctrls.get(cid) != info}
+    if changed:
+        delta["controllers"] = changed
+    return {"seq": state_seq, "delta": delta}
+
+
+def encode_event(event: str, data) -> list:
+    """
+    Encode a Socket.IO event for the root namespace once, as the Engine.IO
+    message packet(s) that any client can be sent as-is.
+    """
+    pkt = socketio.server.packet_class(sio_packet.EVENT, namespace="/", data=[event, data])
+    encoded = pkt.encode()
+    if not isinstance(encoded, list):
+        encoded = [encoded]
+    return [eio_packet.Packet(eio_packet.MESSAGE, data=part) for part in encoded]
+
+
+def broadcast_preencoded(event: str, data):
+    """
+    Send an event to every client in LIVE_ROOM in batches of
+    BROADCAST_BATCH_SIZE, yielding to the server between batches. The event
+    is serialized once and the same packets are queued on every socket.
+    """
+    global broadcast_in_flight
+    try:
+        packets = encode_event(event, data)
+        eio_sids = [eio_sid for _, eio_sid in
+                    socketio.server.manager.get_participants("/", LIVE_ROOM)]
+        for start in range(0, len(eio_sids), BROADCAST_BATCH_SIZE):
+            for eio_sid in eio_sids[start:start + BROADCAST_BATCH_SIZE]:
+                for pkt in packets:
+                    socketio.server.eio.send_packet(eio_sid, pkt)
+            socketio.sleep(0)
+    except Exception as e:
+        logger.error(f"Broadcast error: {e}")
+    finally:
+        broadcast_in_flight = False
+
 
+def simulation_loop():
+    """
+    Background task that runs the simulation.
+
+    Ticks are scheduled against a monotonic deadline rather than a fixed
+    sleep, so time spent inside a tick is not added to the period. When a
+    tick overruns its slot the missed deadlines are dropped (and counted in
+    skipped_ticks) instead of being run back to back to catch up.
+    """
+    global simulation_running, broadcast_in_flight, latest_snapshot, latest
+    global skipped_ticks, pending_migration, pending_level_changes
+
+    next_deadline = time.monotonic()
     while simulation_running:
         try:
             interval = 1.0 / simulation_speed if simulation_speed > 0 else 1.0
-            time.sleep(interval)
-
-            with sim_lock:
+            next_deadline += interval
+            sleep_for = next_deadline - time.monotonic()
+            if sleep_for > 0:
+                socketio.sleep(sleep_for)
+            else:
+                skipped_ticks += 1
+                next_deadline = time.monotonic()
+
+            with sim_lock.gen_wlock():
                 if simulator is None:
                     continue
 
+                # Apply traffic config changes posted since the last tick.
+                # Each change replaces the previous one, so only the most
+                # recent needs to reach the generator.
+                pending = None
+                while True:
+                    try:
+                        pending = config_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if pending is not None:
+                    traffic_gen.set_pattern(*pending)
+
                 # Generate traffic
                 traffic_gen.generate_tick()
 
@@ -84,21 +341,41 @@ def simulation_loop():
 
                 # Take snapshot for time-series
                 snapshot = simulator.engine.take_snapshot()
-
-                # Emit real-time updates via WebSocket
-                try:
-                    socketio.emit("state_update", {
-                        "snapshot": snapshot,
+                latest = build_views()
+
+                if migration_record:
+                    pending_migration = migration_record.to_dict()
+                pending_level_changes.update((k, v) for k, v in level_changes.items() if v)
+
+                # If the previous fan-out is still draining, drop this tick
+                # instead of queueing behind it; the next one carries newer
+                # state, its events and a delta against what was last sent.
+                # Only this thread sets broadcast_in_flight, so a clear flag
+                # stays clear until the broadcast below starts.
+                payload = None
+                if not broadcast_in_flight:
+                    payload = {
+                        **encode_snapshot(snapshot),
                         "traffic": traffic_gen.get_traffic_summary(),
-                        "migration": migration_record.to_dict() if migration_record else None,
-                        "level_changes": {k: v for k, v in level_changes.items() if v},
-                    })
-                except Exception:
-                    pass
+                        "migration": pending_migration,
+                        "level_changes": pending_level_changes,
+                    }
+                    pending_migration, pending_level_changes = None, {}
+                    latest_snapshot = {
+                        "seq": payload["seq"],
+                        "full": snapshot,
+                        "traffic": payload["traffic"],
+                    }
+
+            # Emit real-time updates via WebSocket outside the lock
+            if payload is not None:
+                broadcast_in_flight = True
+                socketio.start_background_task(broadcast_preencoded, "state_update", payload)
 
         except Exception as e:
             logger.error(f"Simulation loop error: {e}")
-            time.sleep(1)
+            # Back off: the next tick is due ERROR_BACKOFF later than usual
+            next_deadline = time.monotonic() + ERROR_BACKOFF
 
 
 # ---------------------------------------------------------------------------
@@ -107,79 +384,90 @@ def simulation_loop():
 
 @app.route("/api/topology", methods=["GET"])
 def get_topology():
-    """Get complete topology data for visualization."""
-    with sim_lock:
-        if simulator is None:
-            return jsonify({"error": "Simulation not initialized"}), 500
-        data = simulator.get_topology_data()
-    return jsonify(data)
+    """
+    Get complete topology data for visualization.
+    The body is encoded, hashed and compressed at most once per published view
+    and content-coding; clients that send the matching ETag in If-None-Match
+    get a 304 without a body.
+    """
+    global _topology_cache
+    views = latest
+    if not views:
+        return jsonify({"error": "Simulation not initialized"}), 500
+
+    topology = views["topology"]
+    cached_view, etag, bodies = _topology_cache
+    if cached_view is not topology:
+        body = orjson.dumps(topology, option=ORJSON_OPTIONS)
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        bodies = {"identity": body}
+        _topology_cache = (topology, etag, bodies)
+
+    encoding = request.accept_encodings.best_match(TOPOLOGY_ENCODINGS) or "identity"
+    body = bodies.get(encoding)
+    if body is None:
+        body = bodies[encoding] = compress_body(bodies["identity"], encoding)
+
+    response = app.response_class(body, mimetype="application/json")
+    if encoding == "identity":
+        response.set_etag(etag)
+    else:
+        response.headers["Content-Encoding"] = encoding
+        response.set_etag(f"{etag}:{encoding}")
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
 
 
 @app.route("/api/controllers", methods=["GET"])
 def get_controllers():
     """Get all controller statuses."""
-    with sim_lock:
-        if simulator is None:
-            return jsonify({"error": "Simulation not initialized"}), 500
-        controllers = []
-        for ctrl_id, ctrl in simulator.engine.controllers.items():
-            info = ctrl.to_dict()
-            info["switch_count"] = len(simulator.engine.get_switches_in_domain(ctrl_id))
-            # Add per-resource totals
-            switches = simulator.engine.get_switches_in_domain(ctrl_id)
-            info["total_cpu_used"] = round(sum(s.load_cpu for s in switches), 2)
-            info["total_mem_used"] = round(sum(s.load_mem for s in switches), 2)
-            info["total_bw_used"] = round(sum(s.load_bw for s in switches), 2)
-            info["cpu_utilization"] = round(info["total_cpu_used"] / ctrl.capacity_cpu * 100, 2) if ctrl.capacity_cpu > 0 else 0
-            info["mem_utilization"] = round(info["total_mem_used"] / ctrl.capacity_mem * 100, 2) if ctrl.capacity_mem > 0 else 0
-            info["bw_utilization"] = round(info["total_bw_used"] / ctrl.capacity_bw * 100, 2) if ctrl.capacity_bw > 0 else 0
-            controllers.append(info)
-    return jsonify(controllers)
+    views = latest
+    if not views:
+        return jsonify({"error": "Simulation not initialized"}), 500
+    return jsonify(views["controllers"])
 
 
 @app.route("/api/switches", methods=["GET"])
 def get_switches():
     """Get all switch details."""
-    with sim_lock:
-        if simulator is None:
-            return jsonify({"error": "Simulation not initialized"}), 500
-        switches = []
-        for sw_id, sw in simulator.engine.switches.items():
-            ctrl = simulator.engine.controllers.get(sw.controller_id)
-            usage = simulator.engine.compute_switch_resource_usage(sw, ctrl) if ctrl else 0
-            info = sw.to_dict()
-            info["resource_usage"] = round(usage * 100, 2)
-            info["distance_to_controller"] = simulator.engine.get_distance(sw_id, sw.controller_id)
-            switches.append(info)
-    return jsonify(switches)
+    views = latest
+    if not views:
+        return jsonify({"error": "Simulation not initialized"}), 500
+    return jsonify(views["switches"])
 
 
 @app.route("/api/migration/history", methods=["GET"])
 def get_migration_history():
     """Get migration history log."""
-    with sim_lock:
+    with sim_lock.gen_rlock():
         if simulator is None:
             return jsonify({"error": "Simulation not initialized"}), 500
         limit = request.args.get("limit", 50, type=int)
-        history = [r.to_dict() for r in simulator.engine.migration_history[-limit:]]
+        records = simulator.engine.migration_history
+        start = max(len(records) - limit, 0) if limit > 0 else 0
+        history = [r.to_dict() for r in islice(records, start, None)]
     return jsonify(history)
 
 
 @app.route("/api/migration/trigger", methods=["POST"])
 def trigger_migration():
     """Manually trigger one round of DLBMT load balancing."""
-    with sim_lock:
+    global latest
+    with sim_lock.gen_wlock():
         if simulator is None:
             return jsonify({"error": "Simulation not initialized"}), 500
 
         # Update levels first
         simulator.engine.update_controller_levels()
         record = simulator.engine.run_load_balancing()
-
         if record:
-            return jsonify({"success": True, "migration": record.to_dict()})
-        else:
-            return jsonify({"success": False, "message": "No migration needed or possible"})
+            latest = build_views()
+
+    if record:
+        return jsonify({"success": True, "migration": record.to_dict()})
+    else:
+        return jsonify({"success": False, "message": "No migration needed or possible"})
 
 
 @app.route("/api/migration/auto", methods=["POST"])
@@ -198,53 +486,41 @@ def toggle_auto_migration():
 @app.route("/api/stats/timeseries", methods=["GET"])
 def get_timeseries():
     """Get time-series load history for charts."""
-    with sim_lock:
-        if simulator is None:
-            return jsonify({"error": "Simulation not initialized"}), 500
-        limit = request.args.get("limit", 60, type=int)
-        history = simulator.engine.load_history[-limit:]
-    return jsonify(history)
+    views = latest
+    if not views:
+        return jsonify({"error": "Simulation not initialized"}), 500
+    limit = request.args.get("limit", 60, type=int)
+    return jsonify(views["timeseries"][-limit:])
 
 
 @app.route("/api/stats/summary", methods=["GET"])
 def get_stats_summary():
     """Get current stats summary."""
-    with sim_lock:
-        if simulator is None:
-            return jsonify({"error": "Simulation not initialized"}), 500
-        stats = simulator.engine.get_stats()
-        stats["traffic"] = traffic_gen.get_traffic_summary()
-        stats["auto_migration"] = auto_migration_enabled
-        stats["simulation_speed"] = simulation_speed
+    views = latest
+    if not views:
+        return jsonify({"error": "Simulation not initialized"}), 500
+    stats = dict(views["stats"])
+    stats["auto_migration"] = auto_migration_enabled
+    stats["simulation_speed"] = simulation_speed
+    stats["skipped_ticks"] = skipped_ticks
     return jsonify(stats)
 
 
 @app.route("/api/stats/comparison", methods=["GET"])
 def get_comparison_stats():
     """Get comparison data matching paper metrics (Tables 4-7)."""
-    with sim_lock:
+    with sim_lock.gen_rlock():
         if simulator is None:
             return jsonify({"error": "Simulation not initialized"}), 500
 
         stats = simulator.engine.get_stats()
-        history = simulator.engine.migration_history
-
-        # Calculate average migration cost
-        avg_cost = sum(r.migration_cost for r in history) / len(history) if history else 0
-
-        # Calculate average imbalance improvement
-        imbalance_improvements = []
-        for r in history:
-            if r.imbalance_before > 0:
-                improvement = (r.imbalance_before - r.imbalance_after) / r.imbalance_before * 100
-                imbalance_improvements.append(improvement)
-        avg_improvement = sum(imbalance_improvements) / len(imbalance_improvements) if imbalance_improvements else 0
+        avg_cost, avg_improvement = simulator.engine.get_migration_averages()
 
         return jsonify({
             "current_topology": simulator.topo_config["name"],
             "avg_load": stats["avg_load"],
             "global_imbalance": stats["global_imbalance"],
-            "total_migrations": len(history),
+            "total_migrations": stats["total_migrations"],
             "avg_migration_cost": round(avg_cost, 4),
             "avg_imbalance_improvement": round(avg_improvement, 2),
             "controller_loads": stats["controller_loads"],
@@ -281,18 +557,21 @@ def list_topologies():
 
 @app.route("/api/config/traffic", methods=["POST"])
 def configure_traffic():
-    """Change traffic pattern and intensity."""
+    """
+    Change traffic pattern and intensity. The change is validated here and
+    queued for the simulation loop, which applies it on its next tick.
+    """
     data = request.get_json() or {}
     pattern = data.get("pattern", "wave")
     intensity = data.get("intensity", 1.0)
 
-    with sim_lock:
-        if traffic_gen is None:
-            return jsonify({"error": "Simulation not initialized"}), 500
-        try:
-            traffic_gen.set_pattern(pattern, intensity)
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+    if traffic_gen is None:
+        return jsonify({"error": "Simulation not initialized"}), 500
+    if pattern not in PATTERNS:
+        return jsonify({"error": f"Invalid pattern: {pattern}. Choose from: {PATTERNS}"}), 400
+    if not isinstance(intensity, (int, float)):
+        return jsonify({"error": "intensity must be a number"}), 400
+    config_queue.put((pattern, intensity))
 
     return jsonify({"pattern": pattern, "intensity": intensity})
 
@@ -313,33 +592,33 @@ def configure_speed():
 
 @socketio.on("connect")
 def handle_connect():
+    """
+    Join the live room and replay the last published topology and keyframe
+    to the new client only. Both come from the cached views, so a burst of
+    reconnects never touches sim_lock.
+    """
     logger.info("Client connected via WebSocket")
-    with sim_lock:
-        if simulator:
-            emit("topology", simulator.get_topology_data())
-            emit("state_update", {
-                "snapshot": simulator.engine.take_snapshot(),
-                "traffic": traffic_gen.get_traffic_summary(),
-                "migration": None,
-                "level_changes": {},
-            })
+    join_room(LIVE_ROOM)
+    views = latest
+    if views:
+        emit("topology", views["topology"], to=request.sid)
+    snapshot = latest_snapshot
+    if snapshot is not None:
+        emit("state_update", {**snapshot, "migration": None, "level_changes": {}},
+             to=request.sid)
 
 
 @socketio.on("request_topology")
 def handle_request_topology():
-    with sim_lock:
-        if simulator:
-            emit("topology", simulator.get_topology_data())
+    views = latest
+    if views:
+        emit("topology", views["topology"], to=request.sid)
 
 
 # ---------------------------------------------------------------------------
 # SPA Serving
 # ---------------------------------------------------------------------------
 
-@app.route("/")
-def serve_index():
-    return send_from_directory(DIST_DIR, "index.html")
-
 @app.errorhandler(404)
 def fallback(e):
     """Serve index.html for SPA client-side routing."""
@@ -350,13 +629,21 @@ def fallback(e):
 # Main
 # ---------------------------------------------------------------------------
 
-if __name__ == "__main__":
-    # Initialize simulation
-    init_simulation("atlanta")
+def start_simulation(topology_name: str = "atlanta"):
+    """Initialize the simulation and start its loop on the Socket.IO worker."""
+    warmup_topologies(TOPOLOGY_SEED)
+    init_simulation(topology_name)
+    socketio.start_background_task(simulation_loop)
+
 
-    # Start background simulation thread
-    sim_thread = threading.Thread(target=simulation_loop, daemon=True)
-    sim_thread.start()
+def create_app():
+    """WSGI entry point for gunicorn: starts the simulation and returns the app."""
+    start_simulation()
+    return app
+
+
+if __name__ == "__main__":
+    start_simulation()
 
     logger.info("Starting DLBMT Dashboard Backend on port 5000...")
     socketio.run(app, host="0.0.0.0", port=5000, debug=False, allow_unsafe_werkzeug=True)
@@ -5,11 +5,15 @@ Implements all formulas (Eq 1-10) and algorithms (Algorithm 1 & 2) from the pape
  with migration of switches" (Computer Communications 238, 2025)
 """
 
+import bisect
 import math
+import sys
 import time
 import logging
+import numpy as np
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 from enum import IntEnum
 
 logger = logging.getLogger(__name__)
@@ -28,27 +32,45 @@ class ControllerLevel(IntEnum):
 
     @property
     def label(self):
-        return {1: "Idle", 2: "Normal", 3: "High Load", 4: "Overload"}[self.value]
+        return _LEVEL_LABELS[self.value - 1]
 
     @property
     def color(self):
-        return {1: "#00ff88", 2: "#00d4ff", 3: "#ffaa00", 4: "#ff006e"}[self.value]
+        return _LEVEL_COLORS[self.value - 1]
+
+
+# Display label and color per level, indexed by level value - 1
+_LEVEL_LABELS = ("Idle", "Normal", "High Load", "Overload")
+_LEVEL_COLORS = ("#00ff88", "#00d4ff", "#ffaa00", "#ff006e")
 
 
 # Threshold boundaries Q[1..4]
 THRESHOLDS = [25, 50, 75, 100]
 
+# Lower bounds of levels 2..4 and the members they map to, for classifying a
+# load with a single bisect (or many loads with one searchsorted)
+_LEVEL_BOUNDS = tuple(THRESHOLDS[:-1])
+_LEVEL_BOUNDS_ARRAY = np.array(_LEVEL_BOUNDS, dtype=np.float64)
+_LEVELS = tuple(ControllerLevel)
+
 # Default weight coefficients (a + b + c = 1)
 DEFAULT_A = 0.4   # CPU weight
 DEFAULT_B = 0.3   # Memory weight
 DEFAULT_C = 0.3   # Bandwidth weight
 
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain classes
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# History bounds
+MIGRATION_HISTORY_LEN = 10_000
+LOAD_HISTORY_LEN = 300            # 5 min of snapshots at 1/sec
+
 
 # ---------------------------------------------------------------------------
 # Data Classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Switch:
     """A switch in the SDN data plane."""
     id: str
@@ -59,6 +81,7 @@ class Switch:
     packet_in_rate: float = 0.0 # Packet-In messages per second
     x: float = 0.0              # Position for topology visualization
     y: float = 0.0
+    idx: int = field(default=-1, repr=False, compare=False)  # Row in the engine's SoA arrays
 
     def to_dict(self):
         return {
@@ -73,7 +96,7 @@ class Switch:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Controller:
     """An SDN controller in the control plane."""
     id: str
@@ -85,6 +108,7 @@ class Controller:
     active: bool = True
     x: float = 0.0
     y: float = 0.0
+    idx: int = field(default=-1, repr=False, compare=False)  # Row in the engine's SoA arrays
 
     def to_dict(self):
         return {
@@ -102,7 +126,7 @@ class Controller:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MigrationRecord:
     """Record of a switch migration event."""
     timestamp: float
@@ -117,23 +141,34 @@ class MigrationRecord:
     migration_cost: float
     imbalance_before: float
     imbalance_after: float
+    time_str: str = field(init=False, repr=False, compare=False)
+
+    # (field, decimal places) of the rounded numeric fields in to_dict()
+    ROUNDED_FIELDS = (
+        ("source_load_before", 2),
+        ("source_load_after", 2),
+        ("target_load_before", 2),
+        ("target_load_after", 2),
+        ("migration_efficiency", 6),
+        ("migration_cost", 4),
+        ("imbalance_before", 4),
+        ("imbalance_after", 4),
+    )
+
+    def __post_init__(self):
+        self.time_str = time.strftime("%H:%M:%S", time.localtime(self.timestamp))
 
     def to_dict(self):
-        return {
+        d = {
             "timestamp": self.timestamp,
-            "time_str": time.strftime("%H:%M:%S", time.localtime(self.timestamp)),
+            "time_str": self.time_str,
             "switch_id": self.switch_id,
             "source_controller": self.source_controller,
             "target_controller": self.target_controller,
-            "source_load_before": round(self.source_load_before, 2),
-            "source_load_after": round(self.source_load_after, 2),
-            "target_load_before": round(self.target_load_before, 2),
-            "target_load_after": round(self.target_load_after, 2),
-            "migration_efficiency": round(self.migration_efficiency, 6),
-            "migration_cost": round(self.migration_cost, 4),
-            "imbalance_before": round(self.imbalance_before, 4),
-            "imbalance_after": round(self.imbalance_after, 4),
         }
+        d.update({name: round(getattr(self, name), ndigits)
+                  for name, ndigits in self.ROUNDED_FIELDS})
+        return d
 
 
 # ---------------------------------------------------------------------------
@@ -155,9 +190,41 @@ class DLBMTEngine:
 
         self.controllers: Dict[str, Controller] = {}
         self.switches: Dict[str, Switch] = {}
-        self.distance_matrix: Dict[Tuple[str, str], float] = {}  # (switch_id, ctrl_id) -> distance
-        self.migration_history: List[MigrationRecord] = []
-        self.load_history: List[dict] = []  # Time-series snapshots
+        # controller_id -> switches in its domain, kept in self.switches order
+        self._domains: Dict[str, List[Switch]] = {}
+        self._sw_order: Dict[str, int] = {}
+        # Hop distance h, rows in self.switches order, columns in
+        # self.controllers order; 1.0 where no distance was set
+        self.distance_matrix = np.ones((0, 0))
+        self.migration_history: Deque[MigrationRecord] = deque(maxlen=MIGRATION_HISTORY_LEN)
+        self.load_history: Deque[dict] = deque(maxlen=LOAD_HISTORY_LEN)  # Time-series snapshots
+        self.migration_count = 0  # All migrations, including ones aged out of the history
+        # Bumped whenever nodes, domains, loads or levels change through the
+        # engine, so views built from it can be reused while it is unchanged
+        self.version = 0
+
+        # Running sums over migration_history for the comparison averages
+        self._mig_cost_sum = 0.0
+        self._mig_improv_sum = 0.0
+        self._mig_improv_n = 0
+
+        # Struct-of-arrays mirror of the switch loads used for per-controller
+        # aggregation; refreshed by sync_arrays() on every level update.
+        # Rows follow insertion order of self.switches / self.controllers.
+        # Domain membership only changes in move_switch(), which keeps
+        # _sw_ctrl_idx current; adding nodes marks it for a rebuild.
+        self._sw_ctrl_dirty = False
+        # Set by set_switch_loads() when the load rows already match the
+        # Switch objects, so the next sync can skip re-reading them
+        self._sw_load_fresh = False
+        self._ctrl_index: Dict[str, int] = {}
+        self._ctrl_capacity = np.zeros((0, 3))      # columns: cpu, mem, bw
+        self._ctrl_inv_capacity = np.zeros((0, 3))  # 1 / capacity, 0 where capacity is 0
+        self._sw_ctrl_idx = np.zeros(0, dtype=np.intp)
+        self._sw_load = np.zeros((0, 3))            # columns: cpu, mem, bw
+        # Unclamped Σ £_ji per controller from the last compute_controller_loads(),
+        # shifted in place by migrations until the next sync
+        self._ctrl_usage = np.zeros(0)
 
     # -----------------------------------------------------------------------
     # Setup
@@ -165,22 +232,137 @@ class DLBMTEngine:
 
     def add_controller(self, controller: Controller):
         self.controllers[controller.id] = controller
+        self._ctrl_index = {ctrl_id: i for i, ctrl_id in enumerate(self.controllers)}
+        controller.idx = self._ctrl_index[controller.id]
+        self._ctrl_capacity = np.array(
+            [(c.capacity_cpu, c.capacity_mem, c.capacity_bw) for c in self.controllers.values()],
+            dtype=np.float64)
+        self._ctrl_inv_capacity = np.zeros_like(self._ctrl_capacity)
+        np.divide(1.0, self._ctrl_capacity, out=self._ctrl_inv_capacity,
+                  where=self._ctrl_capacity > 0)
+        self.distance_matrix = np.pad(self.distance_matrix, ((0, 0), (0, 1)), constant_values=1.0)
+        self._sw_ctrl_dirty = True
+        self.version += 1
 
     def add_switch(self, switch: Switch):
         self.switches[switch.id] = switch
+        switch.idx = self._sw_order[switch.id] = len(self._sw_order)
+        self.distance_matrix = np.pad(self.distance_matrix, ((0, 1), (0, 0)), constant_values=1.0)
+        self._domains.setdefault(switch.controller_id, []).append(switch)
+        self._sw_ctrl_dirty = True
+        self.version += 1
+
+    def move_switch(self, switch: Switch, controller_id: str):
+        """Reassign a switch to another controller's domain."""
+        self._domains[switch.controller_id].remove(switch)
+        domain = self._domains.setdefault(controller_id, [])
+        domain.append(switch)
+        domain.sort(key=lambda s: s.idx)
+        switch.controller_id = controller_id
+        self.version += 1
+        if not self._sw_ctrl_dirty:
+            self._sw_ctrl_idx[switch.idx] = self._ctrl_index.get(controller_id, -1)
 
     def set_distance(self, switch_id: str, controller_id: str, distance: float):
-        self.distance_matrix[(switch_id, controller_id)] = distance
+        self.distance_matrix[self._sw_order[switch_id], self._ctrl_index[controller_id]] = distance
+
+    def set_distances(self, switch_ids: List[str], distances: np.ndarray):
+        """Set whole rows of the distance matrix, one per switch id."""
+        self.distance_matrix[[self._sw_order[s] for s in switch_ids]] = distances
 
     def get_distance(self, switch_id: str, controller_id: str) -> float:
-        return self.distance_matrix.get((switch_id, controller_id), 1.0)
+        i = self._sw_order.get(switch_id)
+        j = self._ctrl_index.get(controller_id)
+        if i is None or j is None:
+            return 1.0
+        return float(self.distance_matrix[i, j])
 
     def get_switches_in_domain(self, controller_id: str) -> List[Switch]:
-        return [s for s in self.switches.values() if s.controller_id == controller_id]
+        return list(self._domains.get(controller_id, ()))
+
+    def domain_size(self, controller_id: str) -> int:
+        return len(self._domains.get(controller_id, ()))
 
     def get_active_controllers(self) -> List[Controller]:
         return [c for c in self.controllers.values() if c.active]
 
+    # -----------------------------------------------------------------------
+    # Vectorized aggregation
+    # -----------------------------------------------------------------------
+
+    def sync_arrays(self):
+        """Copy switch loads (and membership, if stale) into the SoA arrays."""
+        n = len(self.switches)
+        switches = self.switches.values()
+        self.switch_controller_indices()
+        if self._sw_load_fresh and len(self._sw_load) == n:
+            self._sw_load_fresh = False
+            return
+        self._sw_load = np.array(
+            [(s.load_cpu, s.load_mem, s.load_bw) for s in switches], dtype=np.float64).reshape(n, 3)
+        self.version += 1
+
+    def switch_controller_indices(self) -> np.ndarray:
+        """
+        Row in self.controllers order of each switch's controller (-1 if
+        it has none), in self.switches order. Shared; do not modify.
+        """
+        if self._sw_ctrl_dirty:
+            self._sw_ctrl_idx = np.fromiter(
+                (self._ctrl_index.get(s.controller_id, -1) for s in self.switches.values()),
+                dtype=np.intp, count=len(self.switches))
+            self._sw_ctrl_dirty = False
+        return self._sw_ctrl_idx
+
+    def set_switch_loads(self, loads: np.ndarray):
+        """
+        Adopt an (N, 3) cpu/mem/bw load matrix, rows in self.switches order,
+        that was also written to the Switch objects, as the SoA loads.
+        """
+        self._sw_load = loads
+        self._sw_load_fresh = True
+        self.version += 1
+
+    def switch_usage(self) -> np.ndarray:
+        """
+        Eq. 1 usage of every switch on its own controller (0 without one),
+        in self.switches order, as of the last sync_arrays().
+        """
+        idx = self.switch_controller_indices()
+        if len(self._sw_load) != len(idx):
+            self.sync_arrays()  # no load update since switches were added
+        if not len(self._ctrl_index):
+            return np.zeros(len(idx))
+        usage = self._usage_on(self._sw_load, self._ctrl_inv_capacity[idx])
+        usage[idx < 0] = 0.0
+        return usage
+
+    def domain_totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-controller switch counts and summed (cpu, mem, bw) loads, as of
+        the last sync_arrays(). Rows follow the order of self.controllers.
+        Returns (counts[n_ctrl], loads[n_ctrl, 3]).
+        """
+        n_ctrl = len(self._ctrl_index)
+        sw_idx = self.switch_controller_indices()
+        if len(self._sw_load) != len(sw_idx):
+            self.sync_arrays()  # no load update since switches were added
+        owned = sw_idx >= 0
+        idx = sw_idx[owned]
+        loads = self._sw_load[owned]
+        counts = np.bincount(idx, minlength=n_ctrl)
+        totals = np.empty((n_ctrl, 3))
+        for k in range(3):
+            totals[:, k] = np.bincount(idx, weights=loads[:, k], minlength=n_ctrl)
+        return counts, totals
+
+    def domain_utilization(self, totals: np.ndarray) -> np.ndarray:
+        """Per-controller (cpu, mem, bw) utilization in percent; 0 where capacity is 0."""
+        cap = self._ctrl_capacity
+        util = np.zeros_like(totals)
+        np.divide(totals * 100, cap, out=util, where=cap > 0)
+        return util
+
     # -----------------------------------------------------------------------
     # Eq. 1: Per-switch resource usage on controller
     # -----------------------------------------------------------------------
@@ -197,6 +379,15 @@ class DLBMTEngine:
         usage = self.a * cpu_ratio + self.b * mem_ratio + self.c * bw_ratio
         return min(usage, 1.0)
 
+    def _usage_on(self, loads: np.ndarray, inv_capacity: np.ndarray) -> np.ndarray:
+        """
+        Eq. 1 / Eq. 7 over arrays: usage of (..., 3) switch loads on
+        broadcastable (..., 3) reciprocal controller capacities, capped at 1.
+        """
+        ratios = loads * inv_capacity
+        usage = self.a * ratios[..., 0] + self.b * ratios[..., 1] + self.c * ratios[..., 2]
+        return np.minimum(usage, 1.0)
+
     # -----------------------------------------------------------------------
     # Eq. 2 & 3: Controller load calculation
     # -----------------------------------------------------------------------
@@ -208,7 +399,7 @@ class DLBMTEngine:
         Returns load percentage (0-100).
         """
         controller = self.controllers[controller_id]
-        switches = self.get_switches_in_domain(controller_id)
+        switches = self._domains.get(controller_id, ())
 
         total_usage = 0.0
         for switch in switches:
@@ -217,6 +408,32 @@ class DLBMTEngine:
         load_pct = total_usage * 100.0
         return min(load_pct, 100.0)
 
+    def compute_controller_loads(self) -> np.ndarray:
+        """
+        Eq. 1-3 for every controller at once from the SoA arrays: each
+        switch's usage of its own controller, summed per domain.
+        Returns load percentages (0-100) in self.controllers order.
+        """
+        owned = self._sw_ctrl_idx >= 0
+        idx = self._sw_ctrl_idx[owned]
+        usage = self._usage_on(self._sw_load[owned], self._ctrl_inv_capacity[idx])
+        self._ctrl_usage = np.bincount(idx, weights=usage, minlength=len(self._ctrl_index))
+        return np.minimum(self._ctrl_usage * 100.0, 100.0)
+
+    def _shift_switch_usage(self, switch: Switch, source_ctrl: Controller,
+                            target_ctrl: Controller):
+        """
+        Move a switch's usage from the source to the target domain totals and
+        refresh both controllers, without rescanning the other switches.
+        """
+        src = source_ctrl.idx
+        tgt = target_ctrl.idx
+        self._ctrl_usage[src] -= self.compute_switch_resource_usage(switch, source_ctrl)
+        self._ctrl_usage[tgt] += self.compute_switch_resource_on_target(switch, target_ctrl)
+        for ctrl, i in ((source_ctrl, src), (target_ctrl, tgt)):
+            ctrl.load_percentage = min(max(float(self._ctrl_usage[i]), 0.0) * 100.0, 100.0)
+            ctrl.level = self.determine_level(ctrl.load_percentage)
+
     # -----------------------------------------------------------------------
     # Algorithm 1: Multi-level threshold
     # -----------------------------------------------------------------------
@@ -226,27 +443,30 @@ class DLBMTEngine:
         Algorithm 1: Determine controller level based on load.
         Q[1]=25, Q[2]=50, Q[3]=75, Q[4]=100
         """
-        for i, threshold in enumerate(THRESHOLDS):
-            if load < threshold:
-                return ControllerLevel(i + 1)
-        return ControllerLevel.OVERLOAD
+        return _LEVELS[bisect.bisect_right(_LEVEL_BOUNDS, load)]
 
     def update_controller_levels(self) -> Dict[str, bool]:
         """
         Run Algorithm 1 for all controllers.
         Returns dict of controller_id -> whether level changed.
         """
+        self.sync_arrays()
+        loads = self.compute_controller_loads()
+        levels = np.searchsorted(_LEVEL_BOUNDS_ARRAY, loads, side="right").tolist()
+        loads = loads.tolist()
         level_changes = {}
         for ctrl_id, ctrl in self.controllers.items():
             if not ctrl.active:
                 continue
-            load = self.compute_controller_load(ctrl_id)
-            new_level = self.determine_level(load)
+            i = ctrl.idx
+            load = loads[i]
+            new_level = _LEVELS[levels[i]]
             old_level = ctrl.level
 
             ctrl.load_percentage = load
             ctrl.level = new_level
             level_changes[ctrl_id] = (old_level != new_level)
+        self.version += 1
 
         return level_changes
 
@@ -331,6 +551,20 @@ class DLBMTEngine:
                           (target.load_percentage - avg_load) ** 2)
         return math.sqrt(variance) / avg_load
 
+    def compute_global_imbalance(self, loads: List[float]) -> Tuple[float, float]:
+        """
+        Average load and global imbalance (std / mean) of the given
+        active controller loads.
+        """
+        if not loads:
+            return 0, 0
+        n = len(loads)
+        avg_load = sum(loads) / n
+        if avg_load <= 0:
+            return avg_load, 0
+        variance = sum((x - avg_load) ** 2 for x in loads) / n
+        return avg_load, math.sqrt(variance) / avg_load
+
     # -----------------------------------------------------------------------
     # Eq. 9 & 10: Migration efficiency and cost
     # -----------------------------------------------------------------------
@@ -411,103 +645,104 @@ class DLBMTEngine:
     def _find_best_migration_for_source(self, source_ctrl: Controller):
         """
         For a given source controller, find the best (switch, target) pair.
-        Implements Algorithm 2 steps 2-37.
+        Implements Algorithm 2 steps 2-37, scoring every (candidate, target)
+        pair at once from the SoA arrays as of the last sync_arrays().
         """
-        domain_switches = self.get_switches_in_domain(source_ctrl.id)
+        domain_switches = self._domains.get(source_ctrl.id)
         if not domain_switches:
             return None
 
-        # Steps 2-9: Find migration candidates (ρ)
-        # Compute ψ for all switches in domain
-        ratios = {}
-        for switch in domain_switches:
-            ratios[switch.id] = self.compute_migration_ratio(switch, source_ctrl)
-
-        if not ratios:
+        # Targets are the other idle/normal controllers; without one there
+        # is nothing to score
+        active_ctrls = self.get_active_controllers()
+        targets = [c for c in active_ctrls
+                   if c.id != source_ctrl.id
+                   and c.level in (ControllerLevel.IDLE, ControllerLevel.NORMAL)]
+        if not targets:
             return None
 
-        avg_ratio = sum(ratios.values()) / len(ratios)
+        rows = np.fromiter((s.idx for s in domain_switches),
+                           dtype=np.intp, count=len(domain_switches))
+        loads = self._sw_load[rows]
+        src_col = source_ctrl.idx
 
-        # Switches with ratio >= average are migration candidates
-        migration_candidates = [s for s in domain_switches if ratios[s.id] >= avg_ratio]
+        # Steps 2-9: Find migration candidates (ρ)
+        # Eq. 1 / Eq. 4: ψ for all switches in domain
+        usage_src = self._usage_on(loads, self._ctrl_inv_capacity[src_col])
+        dist_src = self.distance_matrix[rows, src_col]
+        ratios = (usage_src * 100.0) / np.where(dist_src <= 0, 1.0, dist_src)
 
-        if not migration_candidates:
+        # Switches with ratio >= average are migration candidates
+        avg_ratio = sum(ratios.tolist()) / len(ratios)
+        cand = np.flatnonzero(ratios >= avg_ratio)
+        if not len(cand):
             return None
 
-        # Steps 10-24: For each candidate switch, find best target controller
-        # Store pairs (switch, target_ctrl, dc_after)
-        valid_pairs = []
-
-        for switch in migration_candidates:
-            best_target = None
-            best_dc = float('inf')
-
-            for target_ctrl in self.get_active_controllers():
-                if target_ctrl.id == source_ctrl.id:
-                    continue
-                if target_ctrl.level not in (ControllerLevel.IDLE, ControllerLevel.NORMAL):
-                    continue
-
-                # Compute post-migration loads (Eq. 5, 6)
-                lr_source_after = self.compute_source_load_after_migration(
-                    source_ctrl, switch)
-                lr_target_after = self.compute_target_load_after_migration(
-                    target_ctrl, switch)
-
-                # Check target level after migration
-                target_level_after = self.determine_level(lr_target_after)
-                if target_level_after not in (ControllerLevel.IDLE, ControllerLevel.NORMAL):
-                    continue  # Remove from candidate list
-
-                # Compute average load after migration
-                active_ctrls = self.get_active_controllers()
-                total_load = sum(c.load_percentage for c in active_ctrls)
-                # Adjust total for the migration
-                total_load = total_load - source_ctrl.load_percentage + lr_source_after
-                total_load = total_load - target_ctrl.load_percentage + lr_target_after
-                avg_load_after = total_load / len(active_ctrls)
-
-                # Eq. 8: Degree of load imbalance after migration
-                dc_after = self.compute_degree_of_imbalance(
-                    lr_source_after, lr_target_after, avg_load_after)
-
-                if dc_after < best_dc:
-                    best_dc = dc_after
-                    best_target = target_ctrl
-                    best_record = {
-                        "lr_source_after": lr_source_after,
-                        "lr_target_after": lr_target_after,
-                        "dc_after": dc_after,
-                    }
-
-            if best_target is not None:
-                valid_pairs.append((switch, best_target, best_dc, best_record))
-
-        if not valid_pairs:
+        # Steps 10-24: best target per candidate
+        tgt_cols = np.array([c.idx for c in targets], dtype=np.intp)
+        tgt_load = np.array([c.load_percentage for c in targets])
+
+        # Eq. 5-7: post-migration loads, (candidates x targets)
+        usage_tgt = self._usage_on(loads[cand, None, :], self._ctrl_inv_capacity[tgt_cols])
+        lr_source_after = np.maximum(source_ctrl.load_percentage - usage_src[cand] * 100.0, 0.0)
+        lr_target_after = tgt_load + usage_tgt * 100.0
+
+        # Drop pairs that would push the target above normal
+        feasible = np.searchsorted(_LEVEL_BOUNDS_ARRAY, lr_target_after, side="right") <= 1
+        if not feasible.any():
+            return None  # no target has headroom for any candidate
+
+        # Average load after migration
+        total_load = sum(c.load_percentage for c in active_ctrls)
+        n_active = len(active_ctrls)
+        avg_load_after = ((total_load - source_ctrl.load_percentage + lr_source_after[:, None])
+                          - tgt_load + lr_target_after) / n_active
+
+        # Eq. 8: Degree of load imbalance after migration
+        dc_after = np.full(usage_tgt.shape, np.inf)
+        ok = feasible & (avg_load_after > 0)
+        variance = 0.5 * ((lr_source_after[:, None] - avg_load_after) ** 2 +
+                          (lr_target_after - avg_load_after) ** 2)
+        np.divide(np.sqrt(variance), avg_load_after, out=dc_after, where=ok)
+
+        # Best target per candidate (first on ties)
+        best_t = dc_after.argmin(axis=1)
+        pick = np.arange(len(cand))
+        best_dc = dc_after[pick, best_t]
+        valid = best_dc < np.inf
+        if not valid.any():
             return None
 
-        # Steps 30-37: Among valid pairs, select the one with best (least) migration efficiency
-        best_result = None
-        best_efficiency = float('inf')
-
-        for switch, target_ctrl, dc_after, record_data in valid_pairs:
-            # Eq. 8: DC before migration
-            dc_before = self.compute_current_imbalance(source_ctrl.id, target_ctrl.id)
-
-            # Eq. 10: Migration cost
-            cost = self.compute_migration_cost(switch, target_ctrl)
+        # Steps 30-37: Among valid pairs, select the one with best (least)
+        # migration efficiency. Eq. 8: DC before migration, per target.
+        avg_load = total_load / n_active
+        if avg_load > 0:
+            dc_before = np.sqrt(0.5 * ((source_ctrl.load_percentage - avg_load) ** 2 +
+                                       (tgt_load - avg_load) ** 2)) / avg_load
+        else:
+            dc_before = np.full(len(targets), np.inf)
+        dc_before = dc_before[best_t]
 
-            # Eq. 9: Migration efficiency
-            efficiency = self.compute_migration_efficiency(dc_after, dc_before, cost)
+        # Eq. 10: Migration cost
+        dist_tgt = self.distance_matrix[rows[cand], tgt_cols[best_t]]
+        cost = np.maximum((usage_tgt[pick, best_t] * 100.0) * dist_tgt, 0.001)
 
-            if efficiency < best_efficiency:
-                best_efficiency = efficiency
-                record_data["dc_before"] = dc_before
-                record_data["cost"] = cost
-                record_data["efficiency"] = efficiency
-                best_result = (switch, target_ctrl, efficiency, record_data)
+        # Eq. 9: Migration efficiency
+        efficiency = np.where(valid, np.abs(best_dc - dc_before) / cost, np.inf)
+        k = int(efficiency.argmin())
+        if not efficiency[k] < np.inf:
+            return None
 
-        return best_result
+        t = int(best_t[k])
+        record_data = {
+            "lr_source_after": float(lr_source_after[k]),
+            "lr_target_after": float(lr_target_after[k, t]),
+            "dc_after": float(best_dc[k]),
+            "dc_before": float(dc_before[k]),
+            "cost": float(cost[k]),
+            "efficiency": float(efficiency[k]),
+        }
+        return domain_switches[cand[k]], targets[t], record_data["efficiency"], record_data
 
     def _execute_migration(self, switch: Switch, source_ctrl: Controller,
                            target_ctrl: Controller, record_data: dict) -> MigrationRecord:
@@ -516,10 +751,11 @@ class DLBMTEngine:
         tgt_load_before = target_ctrl.load_percentage
 
         # Perform migration
-        switch.controller_id = target_ctrl.id
+        self.move_switch(switch, target_ctrl.id)
 
-        # Recalculate loads
-        self.update_controller_levels()
+        # Recalculate loads. Switch loads have not changed since the levels
+        # were last updated, so only the two affected totals move.
+        self._shift_switch_usage(switch, source_ctrl, target_ctrl)
 
         record = MigrationRecord(
             timestamp=time.time(),
@@ -536,14 +772,40 @@ class DLBMTEngine:
             imbalance_after=record_data.get("dc_after", 0),
         )
 
-        self.migration_history.append(record)
-        logger.info(
-            f"Migration: {switch.id} from {source_ctrl.id} → {target_ctrl.id} | "
-            f"Src load: {src_load_before:.1f}→{source_ctrl.load_percentage:.1f} | "
-            f"Tgt load: {tgt_load_before:.1f}→{target_ctrl.load_percentage:.1f}"
-        )
+        self._record_migration(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Migration: {switch.id} from {source_ctrl.id} → {target_ctrl.id} | "
+                f"Src load: {src_load_before:.1f}→{source_ctrl.load_percentage:.1f} | "
+                f"Tgt load: {tgt_load_before:.1f}→{target_ctrl.load_percentage:.1f}"
+            )
         return record
 
+    def _record_migration(self, record: MigrationRecord):
+        """Append to the bounded history, keeping the running sums in step."""
+        if len(self.migration_history) == self.migration_history.maxlen:
+            self._account_migration(self.migration_history[0], -1)
+        self.migration_history.append(record)
+        self._account_migration(record, 1)
+        self.migration_count += 1
+
+    def _account_migration(self, record: MigrationRecord, sign: int):
+        self._mig_cost_sum += sign * record.migration_cost
+        if record.imbalance_before > 0:
+            self._mig_improv_sum += sign * (
+                (record.imbalance_before - record.imbalance_after) / record.imbalance_before * 100)
+            self._mig_improv_n += sign
+
+    def get_migration_averages(self) -> Tuple[float, float]:
+        """
+        Average migration cost and average imbalance improvement (%) over
+        the retained migration history.
+        """
+        n = len(self.migration_history)
+        avg_cost = self._mig_cost_sum / n if n else 0
+        avg_improvement = self._mig_improv_sum / self._mig_improv_n if self._mig_improv_n else 0
+        return avg_cost, avg_improvement
+
     # -----------------------------------------------------------------------
     # Snapshot for time-series
     # -----------------------------------------------------------------------
@@ -551,58 +813,42 @@ class DLBMTEngine:
     def take_snapshot(self) -> dict:
         """Capture current state for time-series tracking."""
         active = self.get_active_controllers()
-        avg_load = sum(c.load_percentage for c in active) / len(active) if active else 0
-
-        # Compute global imbalance
-        if active and avg_load > 0:
-            variance = sum((c.load_percentage - avg_load) ** 2 for c in active) / len(active)
-            global_imbalance = math.sqrt(variance) / avg_load
-        else:
-            global_imbalance = 0
+        loads = [c.load_percentage for c in active]
+        avg_load, global_imbalance = self.compute_global_imbalance(loads)
 
         snapshot = {
             "timestamp": time.time(),
             "controllers": {c.id: {
-                "load": round(c.load_percentage, 2),
+                "load": round(load, 2),
                 "level": c.level.value,
-                "level_label": c.level.label,
-            } for c in active},
+            } for c, load in zip(active, loads)},
             "avg_load": round(avg_load, 2),
             "global_imbalance": round(global_imbalance, 4),
             "total_switches": len(self.switches),
-            "total_migrations": len(self.migration_history),
+            "total_migrations": self.migration_count,
         }
         self.load_history.append(snapshot)
 
-        # Keep only last 300 snapshots (5 min at 1/sec)
-        if len(self.load_history) > 300:
-            self.load_history = self.load_history[-300:]
-
         return snapshot
 
     def get_stats(self) -> dict:
         """Get comprehensive stats for the dashboard."""
         active = self.get_active_controllers()
-        avg_load = sum(c.load_percentage for c in active) / len(active) if active else 0
-
-        if active and avg_load > 0:
-            variance = sum((c.load_percentage - avg_load) ** 2 for c in active) / len(active)
-            global_imbalance = math.sqrt(variance) / avg_load
-        else:
-            global_imbalance = 0
+        loads = [c.load_percentage for c in active]
+        avg_load, global_imbalance = self.compute_global_imbalance(loads)
 
         # Controller domain sizes
-        domain_sizes = {}
-        for ctrl in active:
-            domain_sizes[ctrl.id] = len(self.get_switches_in_domain(ctrl.id))
+        counts, _ = self.domain_totals()
+        counts = counts.tolist()
+        domain_sizes = {ctrl.id: counts[ctrl.idx] for ctrl in active}
 
         return {
             "avg_load": round(avg_load, 2),
             "global_imbalance": round(global_imbalance, 4),
             "total_controllers": len(active),
             "total_switches": len(self.switches),
-            "total_migrations": len(self.migration_history),
+            "total_migrations": self.migration_count,
             "domain_sizes": domain_sizes,
-            "controller_loads": {c.id: round(c.load_percentage, 2) for c in active},
+            "controller_loads": {c.id: round(load, 2) for c, load in zip(active, loads)},
             "controller_levels": {c.id: c.level.label for c in active},
         }
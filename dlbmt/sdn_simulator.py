@@ -4,10 +4,12 @@ Creates realistic topologies with controllers and switches,
 computes distance matrices, and manages the network state.
 """
 
+import functools
 import math
-import random
 import networkx as nx
-from typing import Dict, List, Tuple
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from dlbmt_engine import Controller, Switch, DLBMTEngine, ControllerLevel
 
 
@@ -70,49 +72,201 @@ TOPOLOGIES = {
 }
 
 
-def generate_topology_graph(num_nodes: int, num_edges: int) -> nx.Graph:
-    """Generate a connected graph resembling a network topology."""
+def generate_topology_edges(num_nodes: int, num_edges: int,
+                            seed: Optional[int] = None) -> np.ndarray:
+    """
+    Generate the edges of a connected graph resembling a network topology,
+    as an (E, 2) array of node indices. Pass a seed for a reproducible graph.
+    """
+    rng = np.random.default_rng(seed)
+
     # Start with a spanning tree for connectivity
-    G = nx.Graph()
-    nodes = list(range(num_nodes))
-    G.add_nodes_from(nodes)
-
-    # Create spanning tree
-    shuffled = nodes.copy()
-    random.shuffle(shuffled)
-    for i in range(1, len(shuffled)):
-        G.add_edge(shuffled[i - 1], shuffled[i])
-
-    # Add extra edges to reach desired count
-    extra_needed = num_edges - (num_nodes - 1)
-    attempts = 0
-    while G.number_of_edges() < num_edges and attempts < num_edges * 10:
-        u = random.randint(0, num_nodes - 1)
-        v = random.randint(0, num_nodes - 1)
-        if u != v and not G.has_edge(u, v):
-            G.add_edge(u, v)
-        attempts += 1
+    order = rng.permutation(num_nodes)
+    tree = np.stack([order[:-1], order[1:]], axis=1)
+
+    # Add extra edges to reach desired count, drawn without replacement from
+    # the pairs the spanning tree left unconnected
+    extra_needed = num_edges - len(tree)
+    if extra_needed <= 0:
+        return tree.astype(np.intp)
+    u, v = np.triu_indices(num_nodes, k=1)
+    tree_codes = tree.min(axis=1) * num_nodes + tree.max(axis=1)
+    free = np.flatnonzero(~np.isin(u * num_nodes + v, tree_codes))
+    picked = rng.choice(free, size=min(extra_needed, len(free)), replace=False)
+    extra = np.stack([u[picked], v[picked]], axis=1)
+    return np.concatenate([tree, extra]).astype(np.intp)
+
+
+@dataclass(frozen=True)
+class SimpleGraph:
+    """
+    Undirected graph over nodes 0..N-1, kept as its read-only (E, 2) edge
+    array. NetworkX is only used to lay the graph out.
+    """
+    num_nodes: int
+    edge_array: np.ndarray
+
+    def number_of_nodes(self) -> int:
+        return self.num_nodes
+
+    def number_of_edges(self) -> int:
+        return len(self.edge_array)
+
+    def degree(self) -> np.ndarray:
+        return np.bincount(self.edge_array.ravel(), minlength=self.num_nodes)
+
+    def edges(self) -> List[Tuple[int, int]]:
+        return [tuple(e) for e in self.edge_array.tolist()]
 
+
+def build_graph(num_nodes: int, edge_array: np.ndarray) -> nx.Graph:
+    """Wrap an edge array in a NetworkX graph for layout."""
+    G = nx.Graph()
+    G.add_nodes_from(range(num_nodes))
+    G.add_edges_from(edge_array.tolist())
     return G
 
 
+def hop_counts(num_nodes: int, edge_array: np.ndarray, sources: List[int]) -> np.ndarray:
+    """
+    BFS hop counts from each source node over an undirected edge array, as a
+    (sources x nodes) float array with inf where unreachable. All sources
+    expand together, one boolean matrix product per hop.
+    """
+    adj = np.zeros((num_nodes, num_nodes), dtype=bool)
+    adj[edge_array[:, 0], edge_array[:, 1]] = True
+    adj[edge_array[:, 1], edge_array[:, 0]] = True
+
+    hops = np.full((len(sources), num_nodes), np.inf)
+    frontier = np.zeros((len(sources), num_nodes), dtype=bool)
+    frontier[np.arange(len(sources)), sources] = True
+    visited = frontier.copy()
+    depth = 0
+    while frontier.any():
+        hops[frontier] = depth
+        depth += 1
+        frontier = (frontier @ adj) & ~visited
+        visited |= frontier
+    return hops
+
+
+# Graphs at least this large start the force-directed layout from a spectral
+# embedding, which needs far fewer spring iterations to untangle
+SPECTRAL_LAYOUT_MIN_NODES = 50
+
+
 def assign_positions(G: nx.Graph) -> Dict[int, Tuple[float, float]]:
     """Assign 2D positions to nodes using force-directed layout."""
-    pos = nx.spring_layout(G, k=2.0, iterations=100, seed=42)
+    if G.number_of_nodes() >= SPECTRAL_LAYOUT_MIN_NODES:
+        pos = nx.spring_layout(G, k=2.0, iterations=30, seed=42, pos=nx.spectral_layout(G))
+    else:
+        pos = nx.spring_layout(G, k=2.0, iterations=100, seed=42)
     # Scale to [100, 900] range for SVG
-    xs = [p[0] for p in pos.values()]
-    ys = [p[1] for p in pos.values()]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x > min_x else 1
-    range_y = max_y - min_y if max_y > min_y else 1
+    nodes = list(pos)
+    P = np.array([pos[n] for n in nodes], dtype=np.float64).reshape(len(nodes), 2)
+    lo = P.min(axis=0)
+    span = P.max(axis=0) - lo
+    span[span <= 0] = 1
+    scaled = np.round(np.array([100, 100]) + np.array([700, 500]) * (P - lo) / span, 1)
+    return {n: (x, y) for n, (x, y) in zip(nodes, scaled.tolist())}
+
+
+@functools.lru_cache(maxsize=8)
+def load_topology(topology_name: str, seed: Optional[int] = None
+                  ) -> Tuple[SimpleGraph, Dict[int, Tuple[float, float]]]:
+    """
+    Generate the graph and layout of a named topology once per process and
+    seed. The result is shared by every simulator built on that topology,
+    so the edge array and positions are read-only.
+    """
+    config = TOPOLOGIES[topology_name]
+    edge_array = generate_topology_edges(config["nodes"], config["edges"], seed=seed)
+    edge_array.setflags(write=False)
+    positions = assign_positions(build_graph(config["nodes"], edge_array))
+    return SimpleGraph(config["nodes"], edge_array), positions
+
 
-    scaled = {}
-    for node, (x, y) in pos.items():
-        sx = 100 + 700 * (x - min_x) / range_x
-        sy = 100 + 500 * (y - min_y) / range_y
-        scaled[node] = (round(sx, 1), round(sy, 1))
-    return scaled
+@dataclass(frozen=True)
+class TopologyPlan:
+    """
+    Controller placement, domain assignment and distances derived from a
+    named topology. Shared between simulators, so everything is read-only.
+    """
+    graph: SimpleGraph
+    positions: Dict[int, Tuple[float, float]]
+    controller_nodes: Tuple[int, ...]
+    switch_nodes: Tuple[int, ...]
+    switch_controller: Tuple[int, ...]  # controller index per switch, -1 if unreachable
+    distances: np.ndarray               # (switches x controllers) hop counts
+    edges: Tuple[Tuple[str, str], ...]  # graph edges as (node id, node id)
+
+
+@functools.lru_cache(maxsize=8)
+def plan_topology(topology_name: str, seed: Optional[int] = None) -> TopologyPlan:
+    """
+    Run the expensive part of building a topology once per (name, seed):
+    graph and layout, controller selection, nearest-controller assignment
+    and the distance matrix. Simulators replay the plan into a fresh engine.
+    """
+    config = TOPOLOGIES[topology_name]
+    num_nodes = config["nodes"]
+    num_controllers = config["controllers"]
+
+    # Generate graph (cached per topology name and seed)
+    G, positions = load_topology(topology_name, seed)
+
+    # Select controller nodes (spread across the graph)
+    # Use nodes with highest degree as controllers, lower node index first
+    # among equal degrees. The key is unique per node, so a partial
+    # selection of the top K followed by sorting just those K is exact.
+    degrees = G.degree()
+    rank_key = -degrees * num_nodes + np.arange(num_nodes)
+    top = np.argpartition(rank_key, num_controllers - 1)[:num_controllers]
+    controller_nodes = top[np.argsort(rank_key[top])].tolist()
+
+    # Hop counts from each controller node. The graph is undirected, so
+    # BFS from the controllers gives every (switch, controller) distance
+    # needed below.
+    hops = hop_counts(num_nodes, G.edge_array, controller_nodes)
+
+    # Remaining nodes are switches
+    ctrl_node_ids = {node_id: f"C{i+1}" for i, node_id in enumerate(controller_nodes)}
+    switch_nodes = [n for n in range(num_nodes) if n not in ctrl_node_ids]
+
+    # (switches x controllers) hop matrix, inf where unreachable. argmin
+    # keeps the first controller on ties, like a strict "<" scan would.
+    hop_matrix = hops[:, switch_nodes].T
+    nearest = hop_matrix.argmin(axis=1)
+    reachable = np.isfinite(hop_matrix[np.arange(len(switch_nodes)), nearest])
+    switch_controller = np.where(reachable, nearest, -1)
+
+    # Distance matrix (hop count between each switch and each controller);
+    # unreachable pairs get a default large distance of 10
+    distances = np.where(np.isfinite(hop_matrix), np.maximum(hop_matrix, 1), 10)
+    distances.setflags(write=False)
+
+    # Edges for topology visualization
+    edges = tuple((ctrl_node_ids.get(u) or f"S{u+1}", ctrl_node_ids.get(v) or f"S{v+1}")
+                  for u, v in G.edges())
+
+    return TopologyPlan(
+        graph=G,
+        positions=positions,
+        controller_nodes=tuple(controller_nodes),
+        switch_nodes=tuple(switch_nodes),
+        switch_controller=tuple(switch_controller.tolist()),
+        distances=distances,
+        edges=edges,
+    )
+
+
+def warmup_topologies(seed: Optional[int] = None):
+    """
+    Plan every named topology for the given seed up front, so that later
+    simulators and topology switches only replay a cached plan.
+    """
+    for topology_name in TOPOLOGIES:
+        plan_topology(topology_name, seed)
 
 
 class SDNSimulator:
@@ -120,35 +274,32 @@ class SDNSimulator:
     Simulates a multi-controller SDN environment.
     """
 
-    def __init__(self, topology_name: str = "atlanta"):
+    def __init__(self, topology_name: str = "atlanta", seed: Optional[int] = None):
         self.topology_name = topology_name
         self.topo_config = TOPOLOGIES[topology_name]
-        self.graph: nx.Graph = None
+        self.seed = seed
+        self.graph: SimpleGraph = None
         self.engine = DLBMTEngine()
         self.positions: Dict[int, Tuple[float, float]] = {}
         self.edges: List[Tuple[str, str]] = []
         self.tick_count = 0
+        # (engine version, topology data) of the last get_topology_data()
+        self._topo_cache: Optional[Tuple[int, dict]] = None
 
         self._build_topology()
 
     def _build_topology(self):
         """Build the network topology with controllers and switches."""
-        num_nodes = self.topo_config["nodes"]
-        num_edges = self.topo_config["edges"]
-        num_controllers = self.topo_config["controllers"]
         capacities = self.topo_config["capacities"]
 
-        # Generate graph
-        self.graph = generate_topology_graph(num_nodes, num_edges)
-        self.positions = assign_positions(self.graph)
-
-        # Select controller nodes (spread across the graph)
-        # Use nodes with highest degree as controllers
-        degrees = sorted(self.graph.degree(), key=lambda x: x[1], reverse=True)
-        controller_nodes = [degrees[i][0] for i in range(num_controllers)]
+        # Graph, placement and distances (cached per topology name and seed)
+        plan = plan_topology(self.topology_name, self.seed)
+        self.graph = plan.graph
+        self.positions = plan.positions
 
         # Create controllers
-        for i, node_id in enumerate(controller_nodes):
+        ctrl_ids = []
+        for i, node_id in enumerate(plan.controller_nodes):
             cap = capacities[i]
             pos = self.positions[node_id]
             ctrl = Controller(
@@ -160,62 +311,36 @@ class SDNSimulator:
                 y=pos[1],
             )
             self.engine.add_controller(ctrl)
+            ctrl_ids.append(ctrl.id)
 
         # Assign remaining nodes as switches to nearest controller
-        switch_nodes = [n for n in range(num_nodes) if n not in controller_nodes]
-
-        for node_id in switch_nodes:
-            # Find nearest controller by graph distance
-            min_dist = float('inf')
-            nearest_ctrl = None
+        for node_id, j in zip(plan.switch_nodes, plan.switch_controller):
             pos = self.positions[node_id]
-
-            for ctrl_node, ctrl_id in zip(controller_nodes,
-                                           [f"C{i+1}" for i in range(num_controllers)]):
-                try:
-                    dist = nx.shortest_path_length(self.graph, node_id, ctrl_node)
-                except nx.NetworkXNoPath:
-                    dist = float('inf')
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest_ctrl = ctrl_id
-
             switch = Switch(
                 id=f"S{node_id+1}",
-                controller_id=nearest_ctrl,
+                controller_id=ctrl_ids[j] if j >= 0 else None,
                 x=pos[0],
                 y=pos[1],
             )
             self.engine.add_switch(switch)
 
-        # Compute distance matrix (hop count between each switch and each controller)
-        for switch_id, switch in self.engine.switches.items():
-            s_node = int(switch_id[1:]) - 1  # Convert S1 -> 0
-            for ctrl_id, ctrl in self.engine.controllers.items():
-                c_idx = int(ctrl_id[1:]) - 1
-                c_node = controller_nodes[c_idx]
-                try:
-                    dist = nx.shortest_path_length(self.graph, s_node, c_node)
-                except nx.NetworkXNoPath:
-                    dist = 10  # Default large distance
-                self.engine.set_distance(switch_id, ctrl_id, max(dist, 1))
-
-        # Store edges for topology visualization
-        self.edges = []
-        for u, v in self.graph.edges():
-            node_u = self._node_to_id(u, controller_nodes)
-            node_v = self._node_to_id(v, controller_nodes)
-            self.edges.append((node_u, node_v))
-
-    def _node_to_id(self, node: int, controller_nodes: List[int]) -> str:
-        """Convert graph node index to controller/switch ID."""
-        if node in controller_nodes:
-            idx = controller_nodes.index(node)
-            return f"C{idx+1}"
-        return f"S{node+1}"
+        self.engine.set_distances([f"S{node_id+1}" for node_id in plan.switch_nodes],
+                                  plan.distances)
+
+        # Store edges for topology visualization; the graph links never
+        # change, so their view entries are built once here
+        self.edges = list(plan.edges)
+        self._graph_links = [{"source": u, "target": v} for u, v in self.edges]
+        self._topo_cache = None
 
     def get_topology_data(self) -> dict:
-        """Get complete topology data for visualization."""
+        """
+        Get complete topology data for visualization. The result is reused
+        until the engine changes, so callers must not mutate it.
+        """
+        if self._topo_cache is not None and self._topo_cache[0] == self.engine.version:
+            return self._topo_cache[1]
+
         nodes = []
 
         for ctrl_id, ctrl in self.engine.controllers.items():
@@ -232,28 +357,32 @@ class SDNSimulator:
                 "capacity_cpu": ctrl.capacity_cpu,
                 "capacity_mem": ctrl.capacity_mem,
                 "capacity_bw": ctrl.capacity_bw,
-                "switch_count": len(self.engine.get_switches_in_domain(ctrl.id)),
+                "switch_count": self.engine.domain_size(ctrl.id),
             })
 
-        for sw_id, sw in self.engine.switches.items():
-            ctrl = self.engine.controllers.get(sw.controller_id)
-            usage = self.engine.compute_switch_resource_usage(sw, ctrl) if ctrl else 0
+        # Per-switch numbers rounded to 2 decimals in one array pass:
+        # cpu, mem, bw, packet-in rate, resource usage (%)
+        switches = list(self.engine.switches.values())
+        metrics = np.empty((len(switches), 5))
+        metrics[:, :4] = np.array(
+            [(sw.load_cpu, sw.load_mem, sw.load_bw, sw.packet_in_rate) for sw in switches]
+        ).reshape(len(switches), 4)
+        metrics[:, 4] = self.engine.switch_usage() * 100
+        for sw, (cpu, mem, bw, rate, usage) in zip(switches, metrics.round(2).tolist()):
             nodes.append({
                 "id": sw.id,
                 "type": "switch",
                 "x": sw.x,
                 "y": sw.y,
                 "controller_id": sw.controller_id,
-                "load_cpu": round(sw.load_cpu, 2),
-                "load_mem": round(sw.load_mem, 2),
-                "load_bw": round(sw.load_bw, 2),
-                "packet_in_rate": round(sw.packet_in_rate, 2),
-                "resource_usage": round(usage * 100, 2),
+                "load_cpu": cpu,
+                "load_mem": mem,
+                "load_bw": bw,
+                "packet_in_rate": rate,
+                "resource_usage": usage,
             })
 
-        links = []
-        for u, v in self.edges:
-            links.append({"source": u, "target": v})
+        links = list(self._graph_links)
 
         # Add domain links (switch to controller)
         for sw_id, sw in self.engine.switches.items():
@@ -263,11 +392,13 @@ class SDNSimulator:
                 "type": "domain",
             })
 
-        return {
+        data = {
             "nodes": nodes,
             "links": links,
             "topology_name": self.topo_config["name"],
         }
+        self._topo_cache = (self.engine.version, data)
+        return data
 
     def change_topology(self, topology_name: str):
         """Switch to a different topology."""
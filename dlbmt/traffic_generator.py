@@ -5,11 +5,13 @@ and Bandwidth consumption on controllers.
 """
 
 import math
-import random
 import time
-from typing import Dict, List
+import numpy as np
+from typing import List, Optional
 from dlbmt_engine import Switch, Controller, DLBMTEngine
 
+PATTERNS = ["uniform", "hotspot", "burst", "wave", "stress"]
+
 
 class TrafficGenerator:
     """
@@ -21,13 +23,18 @@ class TrafficGenerator:
     - wave: Sinusoidal traffic pattern that shifts over time
     """
 
-    def __init__(self, engine: DLBMTEngine):
+    def __init__(self, engine: DLBMTEngine, seed: Optional[int] = None):
         self.engine = engine
+        # Private PCG64 stream for all traffic noise; pass a seed to replay it
+        self._rng = np.random.default_rng(seed)
         self.pattern = "wave"
         self.intensity = 1.0        # Global traffic intensity multiplier
         self.tick = 0
-        self.burst_targets: Dict[str, float] = {}
+        # Switches (in engine order) currently bursting, and their rates
+        self.burst_mask = np.zeros(0, dtype=bool)
+        self.burst_rates = np.zeros(0)
         self.burst_timer = 0
+        self._wave_phase = np.zeros(0)  # see _wave_phases()
 
         # Per-switch resource consumption factors
         # These map packet_in_rate to CPU/Mem/BW consumption
@@ -37,13 +44,20 @@ class TrafficGenerator:
         self.mem_per_packet = 2.5      # MB per pkt/s
         self.bw_per_packet = 0.08      # Mbps per pkt/s
 
+        # Packet-In rate totals accumulated by generate_tick(); the summary
+        # dict is rebuilt from them so get_traffic_summary() never iterates
+        self._rate_total = 0.0
+        self._rate_max = 0.0
+        self._summary: dict = {}
+        self._refresh_summary()
+
     def set_pattern(self, pattern: str, intensity: float = 1.0):
         """Change the traffic generation pattern."""
-        valid = ["uniform", "hotspot", "burst", "wave", "stress"]
-        if pattern not in valid:
-            raise ValueError(f"Invalid pattern: {pattern}. Choose from: {valid}")
+        if pattern not in PATTERNS:
+            raise ValueError(f"Invalid pattern: {pattern}. Choose from: {PATTERNS}")
         self.pattern = pattern
         self.intensity = max(0.1, min(intensity, 5.0))
+        self._refresh_summary()
 
     def generate_tick(self):
         """
@@ -56,104 +70,114 @@ class TrafficGenerator:
         controllers = self.engine.get_active_controllers()
 
         if not switches or not controllers:
+            self._refresh_summary()
             return
 
-        # Generate base packet-in rates based on pattern
+        # Generate base packet-in rates based on pattern, one per switch
         rates = self._generate_rates(switches)
 
-        # Apply rates to switches and compute resource consumption
-        for switch in switches:
-            rate = rates.get(switch.id, 10.0) * self.intensity
+        # Apply intensity and some noise to the base rates
+        n = len(switches)
+        pps = rates * self.intensity * (1.0 + self._rng.normal(0, 0.05, n))
+        np.maximum(pps, 0, out=pps)
 
-            # Add some noise
-            rate *= (1.0 + random.gauss(0, 0.05))
-            rate = max(0, rate)
+        # Map packet-in rate to resource consumption for all switches in one
+        # outer product. Each packet-in request consumes CPU, memory, and
+        # bandwidth, scaled by one +-10% jitter per switch.
+        per_packet = np.array([self.cpu_per_packet, self.mem_per_packet, self.bw_per_packet])
+        jitter = 0.9 + self._rng.random(n) * 0.2
+        loads = (pps * jitter)[:, None] * per_packet
 
+        for switch, rate, (cpu, mem, bw) in zip(switches, pps.tolist(), loads.tolist()):
             switch.packet_in_rate = rate
+            switch.load_cpu = cpu
+            switch.load_mem = mem
+            switch.load_bw = bw
+        self.engine.set_switch_loads(loads)
 
-            # Map packet-in rate to resource consumption
-            # Each packet-in request consumes CPU, memory, and bandwidth
-            switch.load_cpu = rate * self.cpu_per_packet * (0.9 + random.random() * 0.2)
-            switch.load_mem = rate * self.mem_per_packet * (0.9 + random.random() * 0.2)
-            switch.load_bw = rate * self.bw_per_packet * (0.9 + random.random() * 0.2)
+        self._rate_total = float(pps.sum())
+        self._rate_max = float(pps.max())
+        self._refresh_summary()
 
-    def _generate_rates(self, switches: List[Switch]) -> Dict[str, float]:
-        """Generate packet-in rates based on current pattern."""
-        rates = {}
+    def _generate_rates(self, switches: List[Switch]) -> np.ndarray:
+        """Generate packet-in rates based on current pattern, in switches order."""
+        n = len(switches)
 
         if self.pattern == "uniform":
-            base = 50.0
-            for sw in switches:
-                rates[sw.id] = base + random.gauss(0, 5)
+            return 50.0 + self._rng.normal(0, 5, n)
 
         elif self.pattern == "hotspot":
             # First 30% of switches in first controller domain get heavy traffic
             all_switch_ids = sorted([s.id for s in switches])
             n_hot = max(1, len(all_switch_ids) // 4)
             hot_switches = set(all_switch_ids[:n_hot])
+            hot = np.fromiter((sw.id in hot_switches for sw in switches), dtype=bool, count=n)
 
-            for sw in switches:
-                if sw.id in hot_switches:
-                    # Heavy traffic: 3-5x normal
-                    rates[sw.id] = 150.0 + random.gauss(0, 20)
-                else:
-                    rates[sw.id] = 30.0 + random.gauss(0, 5)
+            # Heavy traffic: 3-5x normal
+            return np.where(hot, 150.0 + self._rng.normal(0, 20, n),
+                            30.0 + self._rng.normal(0, 5, n))
 
         elif self.pattern == "burst":
             # Periodic bursts on random switches
-            if self.tick % 15 == 0 or not self.burst_targets:
+            if self.tick % 15 == 0 or len(self.burst_mask) != n or not self.burst_mask.any():
                 # New burst targets
-                n_burst = max(1, len(switches) // 5)
-                burst_sws = random.sample(switches, n_burst)
-                self.burst_targets = {sw.id: 200.0 + random.random() * 100
-                                       for sw in burst_sws}
+                n_burst = max(1, n // 5)
+                self.burst_mask = np.zeros(n, dtype=bool)
+                self.burst_mask[self._rng.choice(n, n_burst, replace=False)] = True
+                self.burst_rates = np.where(self.burst_mask, 200.0 + self._rng.random(n) * 100, 0.0)
                 self.burst_timer = 10
 
             self.burst_timer -= 1
             if self.burst_timer <= 0:
-                self.burst_targets = {}
+                self.burst_mask[:] = False
 
-            for sw in switches:
-                if sw.id in self.burst_targets:
-                    rates[sw.id] = self.burst_targets[sw.id]
-                else:
-                    rates[sw.id] = 30.0 + random.gauss(0, 5)
+            return np.where(self.burst_mask, self.burst_rates, 30.0 + self._rng.normal(0, 5, n))
 
         elif self.pattern == "wave":
             # Sinusoidal wave that moves across controllers
             t = self.tick * 0.15
-            all_ctrls = sorted(self.engine.controllers.keys())
-
-            for sw in switches:
-                ctrl_idx = all_ctrls.index(sw.controller_id) if sw.controller_id in all_ctrls else 0
-                phase = ctrl_idx * (2 * math.pi / len(all_ctrls))
-                wave = math.sin(t + phase)
-                # wave goes from -1 to 1, map to traffic rate
-                rate = 40.0 + 60.0 * (wave + 1) / 2  # Range: 40 - 100
-                rates[sw.id] = rate
+            phase = self._wave_phases()[self.engine.switch_controller_indices()]
+            wave = np.sin(t + phase)
+            # wave goes from -1 to 1, map to traffic rate
+            return 40.0 + 60.0 * (wave + 1) / 2  # Range: 40 - 100
 
         elif self.pattern == "stress":
             # Very heavy traffic on all switches to trigger migrations
-            for sw in switches:
-                rates[sw.id] = 120.0 + random.gauss(0, 30)
-
-        return rates
-
-    def get_traffic_summary(self) -> dict:
-        """Get summary of current traffic state."""
-        switches = list(self.engine.switches.values())
-        if not switches:
-            return {"total_pps": 0, "avg_pps": 0, "max_pps": 0, "pattern": self.pattern}
+            return 120.0 + self._rng.normal(0, 30, n)
 
-        total = sum(s.packet_in_rate for s in switches)
-        avg = total / len(switches)
-        max_rate = max(s.packet_in_rate for s in switches)
+        return np.full(n, 10.0)
 
-        return {
-            "total_pps": round(total, 2),
-            "avg_pps": round(avg, 2),
-            "max_pps": round(max_rate, 2),
+    def _wave_phases(self) -> np.ndarray:
+        """
+        Wave phase per controller, in engine controller order, spread evenly
+        by sorted controller id. A trailing 0 serves switches without a
+        controller (index -1).
+        """
+        if len(self._wave_phase) != len(self.engine.controllers) + 1:
+            all_ctrls = sorted(self.engine.controllers.keys())
+            step = 2 * math.pi / len(all_ctrls) if all_ctrls else 0.0
+            self._wave_phase = np.array(
+                [all_ctrls.index(ctrl_id) * step for ctrl_id in self.engine.controllers] + [0.0])
+        return self._wave_phase
+
+    def _refresh_summary(self):
+        """Rebuild the summary dict from the accumulated rate totals."""
+        count = len(self.engine.switches)
+        if not count:
+            self._summary = {"total_pps": 0, "avg_pps": 0, "max_pps": 0, "pattern": self.pattern}
+            return
+        self._summary = {
+            "total_pps": round(self._rate_total, 2),
+            "avg_pps": round(self._rate_total / count, 2),
+            "max_pps": round(self._rate_max, 2),
             "pattern": self.pattern,
             "intensity": self.intensity,
             "tick": self.tick,
         }
+
+    def get_traffic_summary(self) -> dict:
+        """
+        Get summary of current traffic state, as of the last tick or pattern
+        change. The returned dict is shared; callers must not mutate it.
+        """
+        return self._summary